@@ -2,6 +2,8 @@
 # 🌐 NEWSBRIEF AI — DYNAMIC REAL-TIME STREAMLIT APP
 # --------------------------------------------------------------
 
+import re
+
 import streamlit as st
 from datetime import datetime
 from pipeline import generate_news_digest
@@ -30,25 +32,36 @@ Perfect for staying informed — fast.
 
 st.markdown("---")
 
-# ---------------- USER INPUT ----------------
-query = st.text_input(
-    "🔍 Enter a news topic:",
-    placeholder="e.g., iPhone 17 features, AI regulation, electric vehicles"
-)
-
 # ---------------- CACHE WRAPPER ----------------
+def normalize_query(q):
+    """
+    Collapses whitespace and lowercases the topic, so "iPhone 17",
+    "iphone 17 " and "IPHONE  17" all hit one cache entry instead of
+    paying three API calls and three summarization runs.
+    """
+    return re.sub(r"\s+", " ", q.strip().lower())
+
 @st.cache_data(show_spinner=False, ttl=900)
 def cached_news_digest(user_query):
     return generate_news_digest(user_query)
 
-# ---------------- BUTTONS (SIDE BY SIDE) ----------------
-col1, col2 = st.columns(2)
+# ---------------- USER INPUT (FORM) ----------------
+# A form batches widget interactions: the script re-runs only when a
+# submit button is pressed, not on every keystroke in the text box —
+# each of those reruns re-executes this whole file for nothing.
+with st.form("news_form", clear_on_submit=False):
+    query = st.text_input(
+        "🔍 Enter a news topic:",
+        placeholder="e.g., iPhone 17 features, AI regulation, electric vehicles"
+    )
+
+    col1, col2 = st.columns(2)
 
-with col1:
-    get_news = st.button("📰 Get News Summary")
+    with col1:
+        get_news = st.form_submit_button("📰 Get News Summary")
 
-with col2:
-    reset_app = st.button("🔄 Reset")
+    with col2:
+        reset_app = st.form_submit_button("🔄 Reset")
 
 # ---------------- RESET LOGIC ----------------
 if reset_app:
@@ -63,7 +76,7 @@ if get_news:
     else:
         with st.spinner(f"Fetching and summarizing news about **{query}**..."):
             try:
-                results = cached_news_digest(query)
+                results = cached_news_digest(normalize_query(query))
                 st.session_state.results = results
 
             except Exception as e:
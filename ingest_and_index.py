@@ -9,15 +9,19 @@
 
 # ----------- IMPORTS -----------
 import os
-import json
 import sqlite3        # lightweight database built into Python
-from tqdm import tqdm  # shows progress bars in terminal
-from sentence_transformers import SentenceTransformer  # creates embeddings (vector form of text)
+import orjson         # SIMD-accelerated JSON, much faster than stdlib json
+from multiprocessing import cpu_count
+import numpy as np
+from model2vec import StaticModel  # static embeddings: lookup + mean-pool, no transformer
 import faiss           # Facebook AI Similarity Search library for searching by meaning
 
+# Let BLAS / OpenMP use every core for the vector math
+os.environ.setdefault("OMP_NUM_THREADS", str(cpu_count()))
+
 # ----------- CONFIGURATION -----------
 # These are file paths and model names used later
-EMBED_MODEL = "all-MiniLM-L6-v2"   # small, fast embedding model from Hugging Face
+EMBED_MODEL = "minishlab/M2V_base_output"  # Model2Vec distilled from MiniLM — 50-500x faster to encode
 DB_PATH = "news.db"                # where we’ll store article info
 FAISS_INDEX_PATH = "faiss.index"   # where FAISS vector index will be saved
 META_JSONL = "meta.jsonl"          # a simple metadata file for reference
@@ -81,62 +85,95 @@ def init_db():
     """
     conn = sqlite3.connect(DB_PATH)  # connects or creates the DB file
     c = conn.cursor()
+    # WAL lets readers keep working while we write, and synchronous=NORMAL
+    # skips the extra fsync per commit that dominates bulk-insert time
+    c.execute("PRAGMA journal_mode=WAL")
+    c.execute("PRAGMA synchronous=NORMAL")
     c.execute('''CREATE TABLE IF NOT EXISTS articles
                  (id TEXT PRIMARY KEY, title TEXT, source TEXT, date TEXT, url TEXT, tags TEXT)''')
     conn.commit()
     return conn
 
 
-def save_meta(conn, item):
+def save_meta(conn, rows):
     """
-    Saves one article’s metadata into the SQLite database.
-    If the article already exists, it replaces it (to avoid duplicates).
+    Saves all article metadata rows into the SQLite database in ONE
+    transaction. A single commit means a single disk sync — committing
+    per row is up to 1000x slower once you ingest a real corpus.
+    If an article already exists, it replaces it (to avoid duplicates).
     """
     c = conn.cursor()
-    c.execute("INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?)",
-              (item["id"], item["title"], item["source"], item["date"], item["url"], ",".join(item["tags"])))
+    c.executemany("INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?)", rows)
     conn.commit()
 
 
 # ----------- STEP 3: CREATE FAISS INDEX -----------
-def build_faiss_index(docs):
+def build_faiss_index(texts):
     """
-    Turns all article texts into embeddings (vectors)
+    Turns the prepared article texts into embeddings (vectors)
     and stores them in a FAISS index for fast similarity search.
     """
-    print("⚙️ Creating embeddings using SentenceTransformer...")
-    model = SentenceTransformer(EMBED_MODEL)
-
-    # Combine title + text for better context during embedding
-    texts = [d["title"] + "\n\n" + d["text"] for d in docs]
+    # faiss-cpu >= 1.9 picks the fastest SIMD kernel (AVX-512 > AVX2 >
+    # scalar) at import time — log what this CPU offers so a slow scalar
+    # fallback is easy to spot. Model2Vec's dim of 256 is a multiple of 8,
+    # which the vectorized kernels need.
+    print(f"🧮 FAISS instruction sets: {sorted(faiss.supported_instruction_sets())}")
+
+    print("⚙️ Creating embeddings using Model2Vec static embeddings...")
+    # Static embeddings reduce encoding to tokenize + embedding-table
+    # gather + mean-pool — no transformer forward pass at all, which is
+    # 50-500x faster. The ~10-20% quality cost is a fine trade for a
+    # news-digest prototype whose consumer is cosine similarity.
+    model = StaticModel.from_pretrained(EMBED_MODEL)
 
     # Convert text into numerical embeddings (vectors)
-    embeddings = model.encode(texts, show_progress_bar=True, convert_to_numpy=True)
+    embeddings = model.encode(texts, show_progress_bar=False)
 
-    # Normalize the embeddings for cosine similarity search
-    faiss.normalize_L2(embeddings)
+    # Static embeddings aren't unit-length, so normalize in place for
+    # cosine similarity (out= avoids the O(N·d) temporary), and make
+    # sure index.add gets contiguous float32 without copying
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    np.divide(embeddings, np.maximum(norms, 1e-12), out=embeddings)
 
     # Create FAISS index
+    # HNSW walks a small-world graph instead of brute-forcing every vector,
+    # so queries stay fast (with >95% recall) as the corpus grows.
+    # The SQ variant stores vectors as 8-bit scalar-quantized codes — a
+    # quarter of the FP32 footprint, which roughly doubles throughput on
+    # this memory-bound search with <1% recall loss.
     dim = embeddings.shape[1]              # number of dimensions per vector
-    index = faiss.IndexFlatIP(dim)         # IP = inner product (used for cosine similarity)
+    index = faiss.IndexHNSWSQ(dim, faiss.ScalarQuantizer.QT_8bit, 32,
+                              faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = 200        # build a denser graph for better recall
+    index.train(embeddings)                # SQ learns per-dimension value ranges
     index.add(embeddings)                  # add all article vectors to index
 
     # Save FAISS index to file so it can be loaded later
     faiss.write_index(index, FAISS_INDEX_PATH)
     print("💾 FAISS index saved!")
 
-    # Also save metadata (titles, URLs, tags) in a JSON Lines file
-    with open(META_JSONL, "w", encoding="utf-8") as f:
-        for d in docs:
-            f.write(json.dumps({
-                "id": d["id"],
-                "title": d["title"],
-                "url": d["url"],
-                "source": d["source"],
-                "date": d["date"],
-                "tags": d["tags"]
-            }) + "\n")
-    print("🗂️ Metadata file created!")
+
+# ----------- STEP 3b: LOAD FAISS INDEX (QUERY TIME) -----------
+def load_index():
+    """
+    Loads the saved FAISS index for query time.
+    Note: IO_FLAG_MMAP only takes effect for IVF inverted lists — for the
+    HNSW+SQ index written above it is ignored and the data is read into
+    RAM. The flags are kept so a future IVF/OnDiskInvertedLists layout
+    gets mmap behavior for free; today the saving comes from the
+    cache_resource wrapper below, which shares one loaded copy.
+    """
+    return faiss.read_index(FAISS_INDEX_PATH,
+                            faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+
+# Under Streamlit, share one loaded index across sessions instead of
+# re-reading the file per rerun. Guarded so CLI runs still work.
+try:
+    import streamlit as _st
+    load_index = _st.cache_resource(show_spinner=False)(load_index)
+except ImportError:
+    pass  # plain CLI run — faiss.read_index is called directly
 
 
 # ----------- STEP 4: RUN EVERYTHING -----------
@@ -146,14 +183,37 @@ if __name__ == "__main__":
     # 1️⃣ Load our sample articles
     docs = fetch_sample_articles()
 
-    # 2️⃣ Initialize the database
+    # 2️⃣ One pass over the articles: collect embedding texts, DB rows
+    #    and metadata lines together, so the list is walked once instead
+    #    of once per output (a progress bar on 3 items isn't worth the
+    #    per-iteration overhead either)
+    texts = []       # title + body, for embedding context
+    rows = []        # compact tuples for SQLite
+    meta_lines = []  # JSONL bytes for the reference file
+    for d in docs:
+        texts.append(d["title"] + "\n\n" + d["text"])
+        rows.append((d["id"], d["title"], d["source"], d["date"], d["url"],
+                     ",".join(d["tags"])))
+        meta_lines.append(orjson.dumps({
+            "id": d["id"],
+            "title": d["title"],
+            "url": d["url"],
+            "source": d["source"],
+            "date": d["date"],
+            "tags": d["tags"]
+        }) + b"\n")
+
+    # 3️⃣ Save metadata to database (all rows, one transaction)
     conn = init_db()
+    save_meta(conn, rows)
 
-    # 3️⃣ Save metadata to database
-    for d in tqdm(docs, desc="Saving to database"):
-        save_meta(conn, d)
+    # 4️⃣ Write the metadata JSON Lines file in one go (orjson emits
+    #    bytes, so binary mode skips the UTF-8 encode round trip)
+    with open(META_JSONL, "wb") as f:
+        f.writelines(meta_lines)
+    print("🗂️ Metadata file created!")
 
-    # 4️⃣ Build FAISS index
-    build_faiss_index(docs)
+    # 5️⃣ Build FAISS index from the prepared texts
+    build_faiss_index(texts)
 
     print("✅ Done! Index and database created successfully.")